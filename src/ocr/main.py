@@ -1,12 +1,7 @@
 import json
-import os
 import sys
 
-os.environ["PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK"] = "True"
-
-from paddleocr import PaddleOCR  # type: ignore[import-untyped]
-
-from .ocr import process_screenshot
+from .ocr import create_reader, process_screenshot
 
 
 def main() -> None:
@@ -14,12 +9,7 @@ def main() -> None:
         print(f"Usage: {sys.argv[0]} <screenshot> [screenshot ...]", file=sys.stderr)
         sys.exit(1)
 
-    reader = PaddleOCR(
-        text_detection_model_name="PP-OCRv5_mobile_det",
-        use_doc_orientation_classify=False,
-        use_doc_unwarping=False,
-        use_textline_orientation=False,
-    )
+    reader = create_reader()
 
     for path in sys.argv[1:]:
         item = process_screenshot(path, reader)
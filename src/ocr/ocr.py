@@ -1,28 +1,61 @@
+import os
 import sys
 from typing import Any
 
 import cv2
+import numpy as np
 
 from .ocr_engine import extract_text
 from .parser import ItemData, parse_tooltip_text
 from .tooltip_detector import detect_tooltip_region
 
 
-def process_screenshot(image_path: str, reader: Any) -> ItemData | None:
-    """Process a single screenshot through the full pipeline."""
-    image = cv2.imread(image_path)
-    if image is None:
-        print(f"Error: could not read {image_path}", file=sys.stderr)
-        return None
+def create_reader() -> Any:
+    """Create the PaddleOCR reader used by every entry point."""
+    os.environ["PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK"] = "True"
 
+    from paddleocr import PaddleOCR  # type: ignore[import-untyped]
+
+    return PaddleOCR(
+        text_detection_model_name="PP-OCRv5_mobile_det",
+        use_doc_orientation_classify=False,
+        use_doc_unwarping=False,
+        use_textline_orientation=False,
+    )
+
+
+def crop_tooltip(image: np.ndarray) -> np.ndarray | None:
+    """Crop the tooltip region out of a BGR screenshot, or None if not found."""
     region = detect_tooltip_region(image)
     if region is None:
-        print(f"Warning: no tooltip found in {image_path}", file=sys.stderr)
         return None
 
     x, y, w, h = region
-    tooltip_img = image[y : y + h, x : x + w]
+    return image[y : y + h, x : x + w]
 
+
+def process_tooltip(tooltip_img: np.ndarray, reader: Any) -> ItemData:
+    """OCR and parse an already-cropped tooltip image."""
     ocr_results = extract_text(tooltip_img, reader)
 
     return parse_tooltip_text(ocr_results)
+
+
+def process_image(image: np.ndarray, reader: Any, source: str = "<image>") -> ItemData | None:
+    """Process an already-decoded BGR screenshot through the full pipeline."""
+    tooltip_img = crop_tooltip(image)
+    if tooltip_img is None:
+        print(f"Warning: no tooltip found in {source}", file=sys.stderr)
+        return None
+
+    return process_tooltip(tooltip_img, reader)
+
+
+def process_screenshot(image_path: str, reader: Any) -> ItemData | None:
+    """Process a single screenshot through the full pipeline."""
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"Error: could not read {image_path}", file=sys.stderr)
+        return None
+
+    return process_image(image, reader, image_path)
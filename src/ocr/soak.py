@@ -0,0 +1,377 @@
+"""Long-running soak test for a single PaddleOCR reader.
+
+Replays the example screenshots through the full pipeline for many
+iterations, shuffling the order each pass and rescaling every image by a
+random factor so the tooltip crops handed to ``reader.predict`` keep
+changing size. Per-iteration latency, process RSS and the traced Python
+heap are streamed to a CSV, and the run fails if memory grows or latency
+drifts past the configured thresholds.
+
+Usage:
+    python -m src.ocr.soak --iterations 5000 --csv soak.csv
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Any, TextIO
+
+import cv2
+import numpy as np
+
+from .ocr import create_reader, crop_tooltip, process_tooltip
+
+MB = 1024 * 1024
+
+# Crops narrower or shorter than this (e.g. when a small scale pushes the
+# fixed tooltip window off the screenshot) fall back to the unscaled image.
+MIN_CROP_SIDE = 32
+
+# Columns of the per-window metric arrays kept by SoakRecorder
+LATENCY, RSS, HEAP = range(3)
+
+
+@dataclass
+class Sample:
+    iteration: int
+    elapsed_s: float
+    image: str
+    width: int
+    height: int
+    crop_width: int
+    crop_height: int
+    latency_ms: float
+    rss_mb: float | None
+    heap_mb: float | None
+
+
+@dataclass
+class Thresholds:
+    max_rss_growth_mb: float = 200.0
+    max_heap_growth_mb: float = 50.0
+    max_latency_drift: float = 1.5
+
+
+class SoakRecorder:
+    """Stream samples to a CSV, keeping only what the drift check needs.
+
+    Holding every Sample would grow the very heap and RSS numbers being
+    checked, so the baseline window, a ring buffer for the final window and
+    the latency history all live in arrays allocated before tracing starts.
+    Window rows are (latency_ms, rss_mb, heap_mb), with NaN for missing
+    readings.
+    """
+
+    def __init__(self, csv_file: TextIO, iterations: int, warmup: int, window: int) -> None:
+        self.warmup = warmup
+        self.window = window
+        self.count = 0
+        self.last: Sample | None = None
+        self._baseline = np.full((window, 3), np.nan)
+        self._final = np.full((window, 3), np.nan)
+        self._latencies = np.zeros(iterations)
+        self._file = csv_file
+        self._writer = csv.writer(csv_file)
+        self._writer.writerow([fld.name for fld in fields(Sample)])
+        self._file.flush()
+
+    def record(self, sample: Sample) -> None:
+        self._writer.writerow("" if v is None else v for v in astuple(sample))
+        self._file.flush()
+
+        self._latencies[self.count] = sample.latency_ms
+        self.count += 1
+        self.last = sample
+
+        steady = self.count - self.warmup
+        if steady > 0:
+            row = (
+                sample.latency_ms,
+                np.nan if sample.rss_mb is None else sample.rss_mb,
+                np.nan if sample.heap_mb is None else sample.heap_mb,
+            )
+            if steady <= self.window:
+                self._baseline[steady - 1] = row
+            self._final[(steady - 1) % self.window] = row
+
+    def latencies(self) -> np.ndarray:
+        """Latencies (ms) of every recorded iteration so far."""
+        return self._latencies[: self.count]
+
+    def windows(self) -> tuple[np.ndarray, np.ndarray]:
+        """Non-overlapping baseline and final windows of equal size, oldest first."""
+        steady = self.count - self.warmup
+        size = min(self.window, steady // 2)
+        if size <= 0:
+            return np.empty((0, 3)), np.empty((0, 3))
+        final_rows = np.arange(steady - size, steady) % self.window
+        return self._baseline[:size], self._final[final_rows]
+
+
+def find_examples(root: str) -> list[str]:
+    """Return every PNG screenshot below root, in a stable order."""
+    return sorted(str(p) for p in Path(root).rglob("*.png"))
+
+
+def rss_mb() -> float | None:
+    """Current resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / MB
+
+
+def vary_size(
+    image: np.ndarray, rng: random.Random, min_scale: float, max_scale: float
+) -> np.ndarray:
+    """Rescale image by independent random x/y factors in [min_scale, max_scale].
+
+    detect_tooltip_region clamps its fixed crop to the image bounds, so
+    scales below ~0.83 (height) or ~0.66 (width) of a 2560x1440 screenshot
+    shrink the tooltip crop handed to the reader.
+    """
+    h, w = image.shape[:2]
+    new_w = max(1, round(w * rng.uniform(min_scale, max_scale)))
+    new_h = max(1, round(h * rng.uniform(min_scale, max_scale)))
+    interp = cv2.INTER_AREA if new_w * new_h < w * h else cv2.INTER_LINEAR
+    return cv2.resize(image, (new_w, new_h), interpolation=interp)
+
+
+def _median(column: np.ndarray) -> float | None:
+    present = column[~np.isnan(column)]
+    if present.size == 0:
+        return None
+    return float(np.median(present))
+
+
+def check_drift(baseline: np.ndarray, final: np.ndarray, thresholds: Thresholds) -> list[str]:
+    """Compare the baseline and final steady-state windows against the thresholds.
+
+    Args:
+        baseline, final: Window arrays as returned by SoakRecorder.windows.
+
+    Returns:
+        Human-readable failure messages; empty if the run is within limits.
+    """
+    if len(baseline) == 0 or len(final) == 0:
+        return ["not enough samples after warmup to compare windows"]
+
+    failures: list[str] = []
+
+    for label, col, limit in (
+        ("RSS", RSS, thresholds.max_rss_growth_mb),
+        ("Python heap", HEAP, thresholds.max_heap_growth_mb),
+    ):
+        before = _median(baseline[:, col])
+        after = _median(final[:, col])
+        if before is None or after is None:
+            continue
+        growth = after - before
+        if growth > limit:
+            failures.append(
+                f"{label} grew {growth:.1f} MB ({before:.1f} -> {after:.1f}), limit {limit:.1f} MB"
+            )
+
+    before_ms = float(np.median(baseline[:, LATENCY]))
+    after_ms = float(np.median(final[:, LATENCY]))
+    if before_ms > 0:
+        ratio = after_ms / before_ms
+        if ratio > thresholds.max_latency_drift:
+            failures.append(
+                f"median latency drifted {ratio:.2f}x ({before_ms:.1f} -> {after_ms:.1f} ms), "
+                f"limit {thresholds.max_latency_drift:.2f}x"
+            )
+
+    return failures
+
+
+def latency_percentiles(latencies: np.ndarray) -> dict[str, float]:
+    """p50/p95/p99/max of a non-empty latency array, in milliseconds."""
+    return {
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+        "max": float(latencies.max()),
+    }
+
+
+def run_soak(
+    reader: Any,
+    paths: list[str],
+    iterations: int,
+    rng: random.Random,
+    recorder: SoakRecorder,
+    min_scale: float = 0.5,
+    max_scale: float = 1.2,
+    trace_heap: bool = True,
+    progress_every: int = 100,
+) -> None:
+    """Replay paths through the OCR pipeline, recording each iteration.
+
+    Screenshots are decoded once up front so disk I/O doesn't show up in the
+    latency numbers. The order is reshuffled on every pass over the set.
+    Memory is sampled only after the iteration's rescaled frame is released,
+    so its random size doesn't add noise to the heap and RSS readings.
+    """
+    images: dict[str, np.ndarray] = {}
+    for path in paths:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"Warning: could not read {path}, skipping", file=sys.stderr)
+            continue
+        images[path] = image
+    if not images:
+        raise ValueError("no readable screenshots to replay")
+
+    order: list[str] = []
+
+    if trace_heap:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        for i in range(iterations):
+            if not order:
+                order = list(images)
+                rng.shuffle(order)
+            path = order.pop()
+            image = vary_size(images[path], rng, min_scale, max_scale)
+            tooltip_img = crop_tooltip(image)
+            if tooltip_img is None or min(tooltip_img.shape[:2]) < MIN_CROP_SIDE:
+                image = images[path]
+                tooltip_img = crop_tooltip(image)
+            height, width = image.shape[:2]
+            crop_h, crop_w = tooltip_img.shape[:2] if tooltip_img is not None else (0, 0)
+
+            t0 = time.perf_counter()
+            if tooltip_img is not None:
+                process_tooltip(tooltip_img, reader)
+            else:
+                print(f"Warning: no tooltip found in {path}", file=sys.stderr)
+            latency_ms = (time.perf_counter() - t0) * 1000
+            del image, tooltip_img
+
+            heap_mb = tracemalloc.get_traced_memory()[0] / MB if trace_heap else None
+            recorder.record(
+                Sample(
+                    iteration=i,
+                    elapsed_s=time.perf_counter() - start,
+                    image=path,
+                    width=width,
+                    height=height,
+                    crop_width=crop_w,
+                    crop_height=crop_h,
+                    latency_ms=latency_ms,
+                    rss_mb=rss_mb(),
+                    heap_mb=heap_mb,
+                )
+            )
+
+            if progress_every and (i + 1) % progress_every == 0:
+                recent = latency_percentiles(recorder.latencies()[-progress_every:])
+                rss = rss_mb()
+                rss_str = "n/a" if rss is None else f"{rss:.1f} MB"
+                print(
+                    f"[{i + 1}/{iterations}] p50={recent['p50']:.1f} ms "
+                    f"p95={recent['p95']:.1f} ms rss={rss_str}",
+                    file=sys.stderr,
+                )
+    finally:
+        if trace_heap:
+            tracemalloc.stop()
+
+
+def _print_summary(recorder: SoakRecorder, num_paths: int, csv_path: str) -> None:
+    if recorder.last is None:
+        print(f"no iterations completed; header written to {csv_path}")
+        return
+    pct = latency_percentiles(recorder.latencies())
+    print(
+        f"{recorder.count} iterations over {num_paths} screenshots "
+        f"in {recorder.last.elapsed_s:.1f} s"
+    )
+    print(
+        f"latency p50={pct['p50']:.1f} ms p95={pct['p95']:.1f} ms "
+        f"p99={pct['p99']:.1f} ms max={pct['max']:.1f} ms"
+    )
+    print(f"samples written to {csv_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Soak-test a long-lived PaddleOCR reader.")
+    parser.add_argument("--examples", default="examples", help="directory of screenshots to replay")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--min-scale",
+        type=float,
+        default=0.5,
+        help=f"scales leaving a crop side under {MIN_CROP_SIDE}px fall back to the original",
+    )
+    parser.add_argument("--max-scale", type=float, default=1.2)
+    parser.add_argument("--warmup", type=int, default=50, help="iterations ignored by drift checks")
+    parser.add_argument("--window", type=int, default=200, help="samples per comparison window")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=Thresholds.max_rss_growth_mb)
+    parser.add_argument("--max-heap-growth-mb", type=float, default=Thresholds.max_heap_growth_mb)
+    parser.add_argument("--max-latency-drift", type=float, default=Thresholds.max_latency_drift)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip Python heap tracking")
+    parser.add_argument("--csv", default="soak.csv", help="per-iteration output path")
+    args = parser.parse_args()
+
+    if args.iterations < 1:
+        print("Error: --iterations must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    if not 0 < args.min_scale <= args.max_scale:
+        print("Error: scales must satisfy 0 < --min-scale <= --max-scale", file=sys.stderr)
+        sys.exit(1)
+    if args.warmup < 0 or args.window < 1:
+        print("Error: --warmup must be >= 0 and --window >= 1", file=sys.stderr)
+        sys.exit(1)
+
+    paths = find_examples(args.examples)
+    if not paths:
+        print(f"Error: no screenshots found under {args.examples}", file=sys.stderr)
+        sys.exit(1)
+
+    reader = create_reader()
+
+    with open(args.csv, "w", newline="") as csv_file:
+        recorder = SoakRecorder(csv_file, args.iterations, args.warmup, args.window)
+        try:
+            run_soak(
+                reader,
+                paths,
+                args.iterations,
+                random.Random(args.seed),
+                recorder,
+                min_scale=args.min_scale,
+                max_scale=args.max_scale,
+                trace_heap=not args.no_tracemalloc,
+            )
+        except KeyboardInterrupt:
+            print("Interrupted, reporting partial results", file=sys.stderr)
+        finally:
+            _print_summary(recorder, len(paths), args.csv)
+
+    thresholds = Thresholds(
+        max_rss_growth_mb=args.max_rss_growth_mb,
+        max_heap_growth_mb=args.max_heap_growth_mb,
+        max_latency_drift=args.max_latency_drift,
+    )
+    failures = check_drift(*recorder.windows(), thresholds)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print("OK: no leak or latency drift beyond thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,15 @@
-import os
 from typing import Any
 
-os.environ["PADDLE_PDX_DISABLE_MODEL_SOURCE_CHECK"] = "True"
-
 import pytest
-from paddleocr import PaddleOCR  # type: ignore[import-untyped]
 
-from src.ocr.ocr import process_screenshot
+from src.ocr.ocr import create_reader, process_screenshot
 
 EXAMPLES_DIR = "examples/inventory"
 
 
 @pytest.fixture(scope="module")
 def reader() -> Any:
-    return PaddleOCR(
-        text_detection_model_name="PP-OCRv5_mobile_det",
-        use_doc_orientation_classify=False,
-        use_doc_unwarping=False,
-        use_textline_orientation=False,
-    )
+    return create_reader()
 
 
 def test_screenshot_1(reader: Any) -> None:
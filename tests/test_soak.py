@@ -0,0 +1,196 @@
+import csv
+import io
+import random
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ocr.soak import (
+    LATENCY,
+    MIN_CROP_SIDE,
+    Sample,
+    SoakRecorder,
+    Thresholds,
+    check_drift,
+    run_soak,
+    vary_size,
+)
+
+
+class StubReader:
+    def predict(self, _image: np.ndarray) -> list[Any]:
+        return []
+
+
+class FailingReader:
+    def predict(self, _image: np.ndarray) -> list[Any]:
+        raise RuntimeError("boom")
+
+
+def _samples(latencies: list[float], rss: list[float | None]) -> list[Sample]:
+    return [
+        Sample(i, float(i), "x.png", 100, 100, 10, 10, lat, r, 1.0)
+        for i, (lat, r) in enumerate(zip(latencies, rss))
+    ]
+
+
+def _window(latencies: list[float], rss: list[float | None]) -> np.ndarray:
+    return np.array([(lat, np.nan if r is None else r, 1.0) for lat, r in zip(latencies, rss)])
+
+
+def _write_pngs(tmp_path: Path, count: int, size: tuple[int, int] = (60, 40)) -> list[str]:
+    w, h = size
+    paths: list[str] = []
+    for i in range(count):
+        path = str(tmp_path / f"screenshot_{i}.png")
+        cv2.imwrite(path, np.full((h, w, 3), i * 40, dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def _rows(buf: io.StringIO) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(buf.getvalue())))
+
+
+def test_check_drift_passes_when_stable() -> None:
+    window = _window([10.0] * 10, [500.0] * 10)
+    assert check_drift(window, window, Thresholds()) == []
+
+
+def test_check_drift_flags_rss_growth_and_latency() -> None:
+    latencies = [10.0] * 10 + [30.0] * 10
+    rss: list[float | None] = [500.0] * 10 + [900.0] * 10
+    window = _window(latencies, rss)
+    failures = check_drift(window[:10], window[10:], Thresholds())
+    assert len(failures) == 2
+    assert failures[0].startswith("RSS grew")
+    assert failures[1].startswith("median latency drifted")
+
+
+def test_check_drift_ignores_missing_rss() -> None:
+    window = _window([10.0] * 10, [None] * 10)
+    assert check_drift(window[:5], window[5:], Thresholds()) == []
+
+
+def test_check_drift_needs_samples() -> None:
+    empty = np.empty((0, 3))
+    assert len(check_drift(empty, empty, Thresholds())) == 1
+
+
+def test_recorder_windows_do_not_overlap() -> None:
+    buf = io.StringIO()
+    recorder = SoakRecorder(buf, iterations=28, warmup=5, window=4)
+    for sample in _samples([float(i) for i in range(28)], [None] * 28):
+        recorder.record(sample)
+    baseline, final = recorder.windows()
+    assert baseline[:, LATENCY].tolist() == [5.0, 6.0, 7.0, 8.0]
+    assert final[:, LATENCY].tolist() == [24.0, 25.0, 26.0, 27.0]
+    assert len(_rows(buf)) == 28
+
+
+def test_recorder_windows_shrink_for_short_runs() -> None:
+    recorder = SoakRecorder(io.StringIO(), iterations=11, warmup=5, window=10)
+    for sample in _samples([float(i) for i in range(11)], [None] * 11):
+        recorder.record(sample)
+    baseline, final = recorder.windows()
+    assert baseline[:, LATENCY].tolist() == [5.0, 6.0, 7.0]
+    assert final[:, LATENCY].tolist() == [8.0, 9.0, 10.0]
+
+
+def test_recorder_without_steady_samples() -> None:
+    recorder = SoakRecorder(io.StringIO(), iterations=5, warmup=5, window=10)
+    for sample in _samples([1.0] * 5, [None] * 5):
+        recorder.record(sample)
+    baseline, final = recorder.windows()
+    assert len(baseline) == 0 and len(final) == 0
+
+
+def test_vary_size_stays_in_range() -> None:
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    rng = random.Random(0)
+    for _ in range(20):
+        out = vary_size(image, rng, 0.5, 1.5)
+        assert 50 <= out.shape[0] <= 150
+        assert 100 <= out.shape[1] <= 300
+
+
+def test_run_soak_cycles_shuffled_passes(tmp_path: Path) -> None:
+    paths = _write_pngs(tmp_path, 3)
+    missing = str(tmp_path / "missing.png")
+    buf = io.StringIO()
+    recorder = SoakRecorder(buf, iterations=9, warmup=0, window=3)
+
+    run_soak(
+        StubReader(), paths + [missing], 9, random.Random(1), recorder,
+        trace_heap=False, progress_every=0,
+    )
+
+    rows = _rows(buf)
+    assert len(rows) == 9
+    for start in range(0, 9, 3):
+        assert sorted(r["image"] for r in rows[start : start + 3]) == paths
+    assert all(r["heap_mb"] == "" for r in rows)
+
+
+def test_run_soak_varies_crop_size(tmp_path: Path) -> None:
+    paths = _write_pngs(tmp_path, 2, size=(1700, 1200))
+    buf = io.StringIO()
+    recorder = SoakRecorder(buf, iterations=20, warmup=0, window=10)
+
+    run_soak(StubReader(), paths, 20, random.Random(0), recorder, trace_heap=False, progress_every=0)
+
+    rows = _rows(buf)
+    assert len({r["crop_width"] for r in rows}) > 1
+    assert len({r["crop_height"] for r in rows}) > 1
+    assert all(min(int(r["crop_width"]), int(r["crop_height"])) >= MIN_CROP_SIDE for r in rows)
+
+
+def test_run_soak_falls_back_on_degenerate_crop(tmp_path: Path) -> None:
+    paths = _write_pngs(tmp_path, 1, size=(1700, 1200))
+    buf = io.StringIO()
+    recorder = SoakRecorder(buf, iterations=5, warmup=0, window=2)
+
+    # Widths of 510-595 px leave nothing of the fixed crop at x=1100
+    run_soak(
+        StubReader(), paths, 5, random.Random(0), recorder,
+        min_scale=0.3, max_scale=0.35, trace_heap=False, progress_every=0,
+    )
+
+    rows = _rows(buf)
+    assert all((r["width"], r["crop_width"], r["crop_height"]) == ("1700", "600", "880") for r in rows)
+
+
+def test_run_soak_rejects_unreadable_inputs(tmp_path: Path) -> None:
+    recorder = SoakRecorder(io.StringIO(), iterations=1, warmup=0, window=1)
+    with pytest.raises(ValueError):
+        run_soak(StubReader(), [str(tmp_path / "missing.png")], 1, random.Random(0), recorder)
+
+
+def test_run_soak_stops_tracemalloc_on_error(tmp_path: Path) -> None:
+    paths = _write_pngs(tmp_path, 1)
+    buf = io.StringIO()
+    recorder = SoakRecorder(buf, iterations=5, warmup=0, window=1)
+    with pytest.raises(RuntimeError):
+        run_soak(FailingReader(), paths, 5, random.Random(0), recorder, progress_every=0)
+    assert not tracemalloc.is_tracing()
+    assert _rows(buf) == []
+
+
+def test_run_soak_harness_does_not_grow_heap(tmp_path: Path) -> None:
+    paths = _write_pngs(tmp_path, 2)
+    # A real file, not StringIO, so written rows don't accumulate on the traced heap
+    with open(tmp_path / "soak.csv", "w", newline="") as f:
+        recorder = SoakRecorder(f, iterations=3000, warmup=100, window=100)
+        run_soak(StubReader(), paths, 3000, random.Random(0), recorder, progress_every=0)
+
+    baseline, final = recorder.windows()
+    thresholds = Thresholds(
+        max_rss_growth_mb=float("inf"),
+        max_heap_growth_mb=0.05,
+        max_latency_drift=float("inf"),
+    )
+    assert check_drift(baseline, final, thresholds) == []